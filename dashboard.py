@@ -4,17 +4,12 @@ import numpy as np
 import plotly.graph_objects as go
 import yfinance as yf
 from datetime import datetime, timedelta
+from typing import Final
 
-# Set page configuration
-st.set_page_config(
-    page_title="Stock Market Dashboard",
-    page_icon="📈",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+from indicators import Indicators, technical_indicators, technical_indicators_batch
 
 # Custom CSS for modern aesthetics
-st.markdown("""
+_CSS: Final[str] = """
 <style>
     .main {
         background-color: #f8f9fa;
@@ -63,7 +58,28 @@ st.markdown("""
         background-color: #2952cc;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Major indices and popular stocks shown on Market Overview
+INDICES = (
+    ("^GSPC", "S&P 500"),
+    ("^DJI", "Dow Jones"),
+    ("^IXIC", "NASDAQ"),
+    ("^FTSE", "FTSE 100")
+)
+POPULAR_STOCKS = ("AAPL", "MSFT", "GOOGL", "AMZN", "META", "TSLA", "NVDA", "JPM", "V", "WMT")
+QUOTE_SYMBOLS = tuple(symbol for symbol, _ in INDICES) + POPULAR_STOCKS
+
+# Set page configuration
+st.set_page_config(
+    page_title="Stock Market Dashboard",
+    page_icon="📈",
+    layout="wide",
+    initial_sidebar_state="expanded"
+)
+
+# Apply custom CSS on every rerun; Streamlit removes elements a rerun doesn't emit
+st.markdown(_CSS, unsafe_allow_html=True)
 
 # Dashboard header
 col1, col2 = st.columns([1, 5])
@@ -77,39 +93,94 @@ with col2:
 st.sidebar.header("Navigation")
 page = st.sidebar.radio("", ["Market Overview", "Stock Analysis", "Technical Indicators"])
 
+# Cached loaders so reruns reuse recent Yahoo Finance responses
+@st.cache_data(ttl=300, show_spinner=False)
+def _history(symbol, period):
+    return yf.Ticker(symbol).history(period=period)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _info(symbol):
+    return yf.Ticker(symbol).info
+
+# Indicators are cached on the close prices themselves, so widget reruns reuse them
+@st.cache_data(max_entries=64, show_spinner=False)
+def compute_indicators(close):
+    return Indicators(*technical_indicators(close))
+
 # Function to fetch stock data
 def fetch_stock_data(symbol, period='1y'):
     try:
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period=period)
-        return hist, stock.info
+        hist = _history(symbol, period)
+        # Unknown symbols and failed downloads come back as an empty frame
+        if hist.empty:
+            return None, None
+        return hist, _info(symbol)
     except:
         return None, None
 
+# Function to fetch latest quotes for many symbols in one batched request
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_quotes(symbols, chunk_size=20):
+    frames = []
+    # Yahoo accepts at most 20 symbols per batched request; yfinance already
+    # downloads the symbols within each batch on parallel threads
+    for start in range(0, len(symbols), chunk_size):
+        frames.append(yf.download(
+            list(symbols[start:start + chunk_size]),
+            period='5d',
+            interval='1d',
+            group_by='ticker',
+            # Actual closes, so the previous close matches the quoted one on ex-dividend days
+            auto_adjust=False,
+            threads=True,
+            progress=False
+        ))
+    data = pd.concat(frames, axis=1)
+    close = data.xs('Close', axis=1, level=1)
+    volume = data.xs('Volume', axis=1, level=1)
+    
+    # Exchanges trade on different dates, so take each symbol's own last two
+    # sessions: count valid closes from the end and pick rows 1 and 2
+    valid = close.notna()
+    sessions_from_end = valid[::-1].cumsum()[::-1].where(valid)
+    last = sessions_from_end == 1
+    price = close.where(last).max().to_numpy()
+    prev_close = close.where(sessions_from_end == 2).max().to_numpy()
+    
+    # Derive changes for every symbol at once; a non-positive previous close reads as no change
+    change = price - prev_close
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_pct = np.where(prev_close > 0, change / prev_close * 100, 0.0)
+    
+    quotes = pd.DataFrame({
+        'Price': price,
+        'Prev Close': prev_close,
+        'Change': change,
+        'Change %': change_pct,
+        'Volume': volume.where(last).max().to_numpy()
+    }, index=close.columns)
+    # Failed downloads come back as all-NaN columns; leave those symbols out
+    return quotes.dropna(subset=['Price', 'Prev Close'])
+
 # Market Overview Page
 if page == "Market Overview":
     st.header("Market Overview")
     
-    # Major indices
-    indices = {
-        "^GSPC": "S&P 500",
-        "^DJI": "Dow Jones",
-        "^IXIC": "NASDAQ",
-        "^FTSE": "FTSE 100"
-    }
+    # Fetch indices and movers together instead of one request per symbol
+    try:
+        quotes = fetch_quotes(QUOTE_SYMBOLS)
+    except:
+        quotes = pd.DataFrame(columns=['Price', 'Prev Close', 'Change', 'Change %', 'Volume'])
     
     # Create columns for indices
-    cols = st.columns(len(indices))
+    cols = st.columns(len(INDICES))
     
-    for i, (symbol, name) in enumerate(indices.items()):
+    for i, (symbol, name) in enumerate(INDICES):
         with cols[i]:
             try:
-                stock = yf.Ticker(symbol)
-                info = stock.info
-                current_price = info.get('regularMarketPrice', 0)
-                prev_close = info.get('previousClose', 0)
-                change = current_price - prev_close
-                change_pct = (change / prev_close) * 100 if prev_close > 0 else 0
+                current_price = quotes.at[symbol, 'Price']
+                change = quotes.at[symbol, 'Change']
+                change_pct = quotes.at[symbol, 'Change %']
                 
                 st.metric(
                     name,
@@ -123,44 +194,28 @@ if page == "Market Overview":
     # Market movers
     st.subheader("Top Market Movers")
     
-    # Popular stocks to track
-    popular_stocks = ["AAPL", "MSFT", "GOOGL", "AMZN", "META", "TSLA", "NVDA", "JPM", "V", "WMT"]
-    
-    # Create a DataFrame for movers
-    movers_data = []
-    for symbol in popular_stocks:
-        try:
-            stock = yf.Ticker(symbol)
-            info = stock.info
-            current_price = info.get('regularMarketPrice', 0)
-            prev_close = info.get('previousClose', 0)
-            change = current_price - prev_close
-            change_pct = (change / prev_close) * 100 if prev_close > 0 else 0
-            
-            movers_data.append({
-                'Symbol': symbol,
-                'Price': current_price,
-                'Change': change,
-                'Change %': change_pct,
-                'Volume': info.get('regularMarketVolume', 0)
-            })
-        except:
-            continue
-    
-    movers_df = pd.DataFrame(movers_data)
+    # Movers are the popular stocks with a usable quote; changes come precomputed
+    movers_df = (
+        quotes[quotes.index.isin(POPULAR_STOCKS)]
+        .drop(columns='Prev Close')
+        .rename_axis('Symbol')
+        .reset_index()
+        .fillna({'Volume': 0})
+        .astype({'Volume': np.int64})
+    )
     if not movers_df.empty:
         # Sort by absolute change percentage
-        movers_df['Abs Change %'] = movers_df['Change %'].abs()
-        movers_df = movers_df.sort_values('Abs Change %', ascending=False)
+        movers_df = movers_df.sort_values('Change %', key=np.abs, ascending=False)
         
-        # Display movers table
+        # Display movers table; numbers are formatted in the browser so columns still sort numerically
         st.dataframe(
-            movers_df[['Symbol', 'Price', 'Change', 'Change %', 'Volume']].style.format({
-                'Price': '${:.2f}',
-                'Change': '${:+.2f}',
-                'Change %': '{:+.2f}%',
-                'Volume': '{:,.0f}'
-            })
+            movers_df,
+            column_config={
+                'Price': st.column_config.NumberColumn(format='$%.2f'),
+                'Change': st.column_config.NumberColumn(format='$%+.2f'),
+                'Change %': st.column_config.NumberColumn(format='%+.2f%%'),
+                'Volume': st.column_config.NumberColumn(format='%,d')
+            }
         )
     
     # Market sentiment
@@ -168,8 +223,7 @@ if page == "Market Overview":
     
     # VIX (Volatility Index)
     try:
-        vix = yf.Ticker("^VIX")
-        vix_info = vix.info
+        vix_info = _info("^VIX")
         vix_price = vix_info.get('regularMarketPrice', 0)
         
         col1, col2 = st.columns(2)
@@ -183,21 +237,10 @@ if page == "Market Overview":
         
         # Interpret VIX
         with col2:
-            if vix_price < 20:
-                sentiment = "Extreme Greed"
-                color = "green"
-            elif vix_price < 30:
-                sentiment = "Greed"
-                color = "lightgreen"
-            elif vix_price < 40:
-                sentiment = "Neutral"
-                color = "yellow"
-            elif vix_price < 50:
-                sentiment = "Fear"
-                color = "orange"
-            else:
-                sentiment = "Extreme Fear"
-                color = "red"
+            # Bucket edges are exclusive upper bounds, hence side='right'
+            bucket = np.searchsorted([20, 30, 40, 50], vix_price, side='right')
+            sentiment = ["Extreme Greed", "Greed", "Neutral", "Fear", "Extreme Fear"][bucket]
+            color = ["green", "lightgreen", "yellow", "orange", "red"][bucket]
             
             st.markdown(f"""
             <div style="
@@ -222,9 +265,10 @@ elif page == "Stock Analysis":
     
     if stock_symbol:
         with st.spinner(f"Fetching data for {stock_symbol}..."):
-            hist, info = fetch_stock_data(stock_symbol)
+            # The widest period is fetched once; the period selector below slices it
+            hist_full, info = fetch_stock_data(stock_symbol, '5y')
             
-            if hist is not None and info is not None:
+            if hist_full is not None and info is not None:
                 # Company info
                 col1, col2, col3 = st.columns(3)
                 
@@ -253,19 +297,31 @@ elif page == "Stock Analysis":
                 time_period = st.radio(
                     "Select Time Period:",
                     ["1 Month", "3 Months", "6 Months", "1 Year", "5 Years"],
+                    index=3,
                     horizontal=True
                 )
                 
-                period_mapping = {
-                    "1 Month": "1mo",
-                    "3 Months": "3mo",
-                    "6 Months": "6mo",
-                    "1 Year": "1y",
-                    "5 Years": "5y"
+                cutoffs = {
+                    "1 Month": pd.DateOffset(months=1),
+                    "3 Months": pd.DateOffset(months=3),
+                    "6 Months": pd.DateOffset(months=6),
+                    "1 Year": pd.DateOffset(years=1),
+                    "5 Years": pd.DateOffset(years=5)
                 }
                 
-                # Fetch data for selected period
-                hist = yf.Ticker(stock_symbol).history(period=period_mapping[time_period])
+                # Slice the selected range locally
+                hist = hist_full.loc[hist_full.index >= hist_full.index[-1] - cutoffs[time_period]]
+                
+                # Plot weekly bars for long ranges to keep the chart payload small,
+                # each dated on the Monday that starts its week
+                if len(hist) > 500:
+                    hist = hist.resample('W-MON', label='left', closed='left').agg({
+                        'Open': 'first',
+                        'High': 'max',
+                        'Low': 'min',
+                        'Close': 'last',
+                        'Volume': 'sum'
+                    }).dropna()
                 
                 # Create candlestick chart
                 fig = go.Figure(data=[go.Candlestick(
@@ -280,10 +336,12 @@ elif page == "Stock Analysis":
                     title=f"{stock_symbol} Stock Price",
                     yaxis_title="Price ($)",
                     xaxis_title="Date",
-                    height=500
+                    height=500,
+                    # Keep zoom across reruns, but reset it when the symbol or range changes
+                    uirevision=f"{stock_symbol}-{time_period}"
                 )
                 
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True, config={'staticPlot': False})
                 
                 # Company info
                 st.subheader("Company Information")
@@ -326,112 +384,97 @@ elif page == "Technical Indicators":
             hist, info = fetch_stock_data(stock_symbol)
             
             if hist is not None:
-                # Calculate technical indicators
-                # RSI
-                delta = hist['Close'].diff()
-                gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-                rs = gain / loss
-                rsi = 100 - (100 / (1 + rs))
-                
-                # MACD
-                exp1 = hist['Close'].ewm(span=12, adjust=False).mean()
-                exp2 = hist['Close'].ewm(span=26, adjust=False).mean()
-                macd = exp1 - exp2
-                signal = macd.ewm(span=9, adjust=False).mean()
-                
-                # Bollinger Bands
-                sma = hist['Close'].rolling(window=20).mean()
-                std = hist['Close'].rolling(window=20).std()
-                upper_band = sma + (std * 2)
-                lower_band = sma - (std * 2)
-                
-                # Create subplots
-                fig = go.Figure()
-                
-                # Add candlestick chart
-                fig.add_trace(go.Candlestick(
-                    x=hist.index,
-                    open=hist['Open'],
-                    high=hist['High'],
-                    low=hist['Low'],
-                    close=hist['Close'],
-                    name='Price'
-                ))
-                
-                # Add Bollinger Bands
-                fig.add_trace(go.Scatter(
-                    x=hist.index,
-                    y=upper_band,
-                    name='Upper BB',
-                    line=dict(color='gray', dash='dash')
-                ))
-                
-                fig.add_trace(go.Scatter(
-                    x=hist.index,
-                    y=lower_band,
-                    name='Lower BB',
-                    line=dict(color='gray', dash='dash')
-                ))
-                
-                fig.add_trace(go.Scatter(
-                    x=hist.index,
-                    y=sma,
-                    name='SMA 20',
-                    line=dict(color='blue')
-                ))
-                
-                fig.update_layout(
-                    title=f"{stock_symbol} Price with Bollinger Bands",
-                    yaxis_title="Price ($)",
-                    xaxis_title="Date",
-                    height=500
+                # Writable copy: cached frames hand out read-only views the kernel signature rejects
+                close = hist['Close'].to_numpy(np.float64, copy=True)
+                
+                # Calculate technical indicators (RSI, MACD, Bollinger Bands)
+                rsi, macd, signal, sma, upper_band, lower_band = compute_indicators(close)
+                
+                # Price with Bollinger Bands, built in a single Figure call
+                fig = go.Figure(
+                    data=[
+                        go.Candlestick(
+                            x=hist.index,
+                            open=hist['Open'],
+                            high=hist['High'],
+                            low=hist['Low'],
+                            close=hist['Close'],
+                            name='Price'
+                        ),
+                        go.Scatter(
+                            x=hist.index,
+                            y=upper_band,
+                            name='Upper BB',
+                            line=dict(color='gray', dash='dash')
+                        ),
+                        go.Scatter(
+                            x=hist.index,
+                            y=lower_band,
+                            name='Lower BB',
+                            line=dict(color='gray', dash='dash')
+                        ),
+                        go.Scatter(
+                            x=hist.index,
+                            y=sma,
+                            name='SMA 20',
+                            line=dict(color='blue')
+                        )
+                    ],
+                    layout=go.Layout(
+                        title=f"{stock_symbol} Price with Bollinger Bands",
+                        yaxis_title="Price ($)",
+                        xaxis_title="Date",
+                        height=500
+                    )
                 )
                 
                 st.plotly_chart(fig, use_container_width=True)
                 
-                # RSI Chart
-                fig_rsi = go.Figure()
-                fig_rsi.add_trace(go.Scatter(
-                    x=hist.index,
-                    y=rsi,
-                    name='RSI',
-                    line=dict(color='purple')
-                ))
-                
-                fig_rsi.add_hline(y=70, line_dash="dash", line_color="red")
-                fig_rsi.add_hline(y=30, line_dash="dash", line_color="green")
-                
-                fig_rsi.update_layout(
-                    title="Relative Strength Index (RSI)",
-                    yaxis_title="RSI",
-                    xaxis_title="Date",
-                    height=300
+                # RSI Chart with overbought/oversold lines
+                fig_rsi = go.Figure(
+                    data=[go.Scatter(
+                        x=hist.index,
+                        y=rsi,
+                        name='RSI',
+                        line=dict(color='purple')
+                    )],
+                    layout=go.Layout(
+                        title="Relative Strength Index (RSI)",
+                        yaxis_title="RSI",
+                        xaxis_title="Date",
+                        height=300,
+                        shapes=[
+                            dict(type='line', xref='paper', x0=0, x1=1, y0=level, y1=level,
+                                 line=dict(color=color, dash='dash'))
+                            for level, color in [(70, 'red'), (30, 'green')]
+                        ]
+                    )
                 )
                 
                 st.plotly_chart(fig_rsi, use_container_width=True)
                 
                 # MACD Chart
-                fig_macd = go.Figure()
-                fig_macd.add_trace(go.Scatter(
-                    x=hist.index,
-                    y=macd,
-                    name='MACD',
-                    line=dict(color='blue')
-                ))
-                
-                fig_macd.add_trace(go.Scatter(
-                    x=hist.index,
-                    y=signal,
-                    name='Signal',
-                    line=dict(color='orange')
-                ))
-                
-                fig_macd.update_layout(
-                    title="MACD",
-                    yaxis_title="MACD",
-                    xaxis_title="Date",
-                    height=300
+                fig_macd = go.Figure(
+                    data=[
+                        go.Scatter(
+                            x=hist.index,
+                            y=macd,
+                            name='MACD',
+                            line=dict(color='blue')
+                        ),
+                        go.Scatter(
+                            x=hist.index,
+                            y=signal,
+                            name='Signal',
+                            line=dict(color='orange')
+                        )
+                    ],
+                    layout=go.Layout(
+                        title="MACD",
+                        yaxis_title="MACD",
+                        xaxis_title="Date",
+                        height=300
+                    )
                 )
                 
                 st.plotly_chart(fig_macd, use_container_width=True)
@@ -442,7 +485,7 @@ elif page == "Technical Indicators":
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
-                    current_rsi = rsi.iloc[-1]
+                    current_rsi = rsi[-1]
                     st.metric(
                         "RSI",
                         f"{current_rsi:.2f}",
@@ -450,8 +493,8 @@ elif page == "Technical Indicators":
                     )
                 
                 with col2:
-                    current_macd = macd.iloc[-1]
-                    current_signal = signal.iloc[-1]
+                    current_macd = macd[-1]
+                    current_signal = signal[-1]
                     st.metric(
                         "MACD",
                         f"{current_macd:.2f}",
@@ -459,8 +502,8 @@ elif page == "Technical Indicators":
                     )
                 
                 with col3:
-                    current_price = hist['Close'].iloc[-1]
-                    current_bb_position = (current_price - lower_band.iloc[-1]) / (upper_band.iloc[-1] - lower_band.iloc[-1]) * 100
+                    current_price = close[-1]
+                    current_bb_position = (current_price - lower_band[-1]) / (upper_band[-1] - lower_band[-1]) * 100
                     st.metric(
                         "BB Position",
                         f"{current_bb_position:.1f}%",
@@ -468,6 +511,44 @@ elif page == "Technical Indicators":
                     )
             else:
                 st.error(f"Unable to fetch data for {stock_symbol}")
+    
+    # Watchlist comparison
+    watchlist = st.text_input("Compare a watchlist (comma-separated, e.g., AAPL, MSFT, NVDA):", "")
+    watchlist_symbols = [symbol.strip().upper() for symbol in watchlist.split(',') if symbol.strip()]
+    
+    if watchlist_symbols:
+        st.subheader("Watchlist Indicators")
+        
+        with st.spinner("Calculating watchlist indicators..."):
+            closes = {}
+            for symbol in watchlist_symbols:
+                try:
+                    symbol_hist = _history(symbol, '1y')
+                    if not symbol_hist.empty:
+                        closes[symbol] = symbol_hist['Close'].set_axis(symbol_hist.index.tz_localize(None))
+                except:
+                    continue
+            
+            # Align on common trading days so every symbol has the same length
+            closes = pd.DataFrame(closes).dropna()
+            
+            if not closes.empty:
+                # One row per symbol; copy() gives the kernel a writable C-contiguous block
+                rsi, macd, signal, sma, upper_band, lower_band = technical_indicators_batch(
+                    closes.to_numpy(np.float64).T.copy()
+                )
+                latest = closes.to_numpy(np.float64)[-1]
+                
+                st.dataframe(pd.DataFrame({
+                    'Symbol': closes.columns,
+                    'Price': latest,
+                    'RSI': rsi[:, -1],
+                    'MACD': macd[:, -1],
+                    'Signal': signal[:, -1],
+                    'BB Position %': (latest - lower_band[:, -1]) / (upper_band[:, -1] - lower_band[:, -1]) * 100
+                }).round(2))
+            else:
+                st.error("Unable to fetch data for the watchlist")
 
 # Footer
 st.markdown("""
@@ -0,0 +1,117 @@
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Fall back to plain Python when numba is not installed
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+# Kernel outputs, one array per indicator
+Indicators = namedtuple('Indicators', ['rsi', 'macd', 'signal', 'sma', 'upper_band', 'lower_band'])
+
+# Kernels live in this module rather than in dashboard.py so Streamlit's
+# script reruns don't redefine them. The explicit signatures compile them
+# when the module is first imported; cache=True stores the machine code in
+# __pycache__ so only the very first launch pays the compile cost.
+
+# Single-pass RSI (Wilder, 14), MACD (12/26/9) and Bollinger Bands (20, 2 std)
+@njit('Tuple((f8[:], f8[:], f8[:], f8[:], f8[:], f8[:]))(f8[:])', cache=True)
+def technical_indicators(close):
+    n = close.shape[0]
+    rsi = np.full(n, np.nan)
+    macd = np.empty(n)
+    signal = np.empty(n)
+    sma = np.full(n, np.nan)
+    upper_band = np.full(n, np.nan)
+    lower_band = np.full(n, np.nan)
+    if n == 0:
+        return rsi, macd, signal, sma, upper_band, lower_band
+    
+    avg_gain = 0.0
+    avg_loss = 0.0
+    ema_fast = close[0]
+    ema_slow = close[0]
+    ema_signal = 0.0
+    # Running sums over the trailing 20 closes, offset by the first close
+    # to limit cancellation in the variance
+    offset = close[0]
+    window_sum = 0.0
+    window_sq_sum = 0.0
+    
+    for i in range(n):
+        x = close[i]
+        
+        # MACD, with every EMA carried as a scalar: y += alpha * (x - y)
+        ema_fast += (2 / 13) * (x - ema_fast)
+        ema_slow += (2 / 27) * (x - ema_slow)
+        macd_value = ema_fast - ema_slow
+        ema_signal += (2 / 10) * (macd_value - ema_signal)
+        macd[i] = macd_value
+        signal[i] = ema_signal
+        
+        # RSI, seeded with the simple average of the first 14 moves
+        if i > 0:
+            delta = x - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if i <= 14:
+                avg_gain += gain / 14
+                avg_loss += loss / 14
+            else:
+                avg_gain += (gain - avg_gain) / 14
+                avg_loss += (loss - avg_loss) / 14
+            if i >= 14:
+                if avg_loss == 0:
+                    rsi[i] = 100.0
+                else:
+                    rsi[i] = 100 - 100 / (1 + avg_gain / avg_loss)
+        
+        # Bollinger Bands
+        dx = x - offset
+        window_sum += dx
+        window_sq_sum += dx * dx
+        if i >= 20:
+            dx = close[i - 20] - offset
+            window_sum -= dx
+            window_sq_sum -= dx * dx
+        if i >= 19:
+            mean = window_sum / 20
+            var = max((window_sq_sum - window_sum * mean) / 19, 0.0)
+            std = np.sqrt(var)
+            sma[i] = mean + offset
+            upper_band[i] = sma[i] + std * 2
+            lower_band[i] = sma[i] - std * 2
+    
+    return rsi, macd, signal, sma, upper_band, lower_band
+
+# Indicators for several symbols at once; each row of closes is one symbol
+# aligned on the same dates. Rows are spread across threads and the GIL is
+# released so Streamlit's main thread stays responsive.
+@njit('Tuple((f8[:, :], f8[:, :], f8[:, :], f8[:, :], f8[:, :], f8[:, :]))(f8[:, :])',
+      parallel=True, nogil=True, cache=True)
+def technical_indicators_batch(closes):
+    nsym, n = closes.shape
+    rsi = np.empty((nsym, n))
+    macd = np.empty((nsym, n))
+    signal = np.empty((nsym, n))
+    sma = np.empty((nsym, n))
+    upper_band = np.empty((nsym, n))
+    lower_band = np.empty((nsym, n))
+    
+    for s in prange(nsym):
+        row = technical_indicators(closes[s])
+        rsi[s] = row[0]
+        macd[s] = row[1]
+        signal[s] = row[2]
+        sma[s] = row[3]
+        upper_band[s] = row[4]
+        lower_band[s] = row[5]
+    
+    return rsi, macd, signal, sma, upper_band, lower_band